@@ -1,11 +1,15 @@
 import json
+from collections import OrderedDict
 
 from coreapi.codecs.base import BaseCodec
-from coreapi.compat import force_bytes
+from coreapi.compat import COMPACT_SEPARATORS, force_bytes
 from coreapi.document import Document
 from coreapi.exceptions import ParseError
-from openapi_codec.encode import generate_swagger_object
-from openapi_codec.decode import _parse_document
+from openapi_codec.encode import generate_swagger_object, generate_swagger_shards
+from openapi_codec.decode import Limits, _parse_document, _parse_sharded_document
+from openapi_codec.diff import diff_spec_hashes, get_spec_hashes
+from openapi_codec.incremental import _parse_document_incremental
+from openapi_codec.normalize import _generate_swagger_object, _parse_links
 
 
 __version__ = '1.3.2'
@@ -18,21 +22,149 @@ class OpenAPICodec(BaseCodec):
     def decode(self, bytes, **options):
         """
         Takes a bytestring and returns a document.
+
+        When decoding untrusted input, any of `max_bytes`, `max_operations`,
+        `max_parameters`, `max_ref_depth` and `timeout` (in seconds) may be
+        used to limit the resources used. A `ParseError` is raised as soon as
+        a limit is exceeded. The other decoding methods accept the same
+        options.
+
+        Use `zero_copy=True` to read the spec without allocating copies of
+        its contents, which is faster and uses less memory for large specs.
+        The decoded document is the same.
         """
-        try:
-            data = json.loads(bytes.decode('utf-8'))
-        except ValueError as exc:
-            raise ParseError('Malformed JSON. %s' % exc)
+        limits = _get_limits(options)
+        data = _load_json(bytes, options.get('max_bytes'), limits)
 
         base_url = options.get('base_url')
-        doc = _parse_document(data, base_url)
+        zero_copy = options.get('zero_copy', False)
+        doc = _parse_document(data, base_url, limits, zero_copy)
         if not isinstance(doc, Document):
             raise ParseError('Top level node must be a document.')
 
         return doc
 
+    def decode_incremental(self, bytes, previous=None, **options):
+        """
+        Takes a bytestring and returns a `DecodeResult`, whose `document`
+        attribute is the decoded document.
+
+        Passing the result of a previous decode as `previous` allows links
+        to be reused for any unchanged path items. Accepts the same limits
+        as `decode`.
+        """
+        limits = _get_limits(options)
+        data = _load_json(bytes, options.get('max_bytes'), limits)
+
+        base_url = options.get('base_url')
+        return _parse_document_incremental(data, base_url, previous, limits)
+
     def encode(self, document, **options):
         if not isinstance(document, Document):
             raise TypeError('Expected a `coreapi.Document` instance')
-        data = generate_swagger_object(document)
-        return force_bytes(json.dumps(data))
+        compact = options.get('compact', False)
+        workers = options.get('workers')
+        data = generate_swagger_object(document, compact, workers)
+        return force_bytes(_dump_json(data, compact))
+
+    def normalize(self, bytes, **options):
+        """
+        Takes a bytestring and returns a bytestring, with the same result as
+        `encode(decode(bytes))`, but without building an intermediate document.
+        """
+        base_url = options.get('base_url')
+        compact = options.get('compact', False)
+        workers = options.get('workers')
+
+        limits = _get_limits(options)
+        data = _load_json(bytes, options.get('max_bytes'), limits)
+
+        # The parsed input is released before the output is generated.
+        document, links = _parse_links(data, base_url, limits)
+        del data
+        data = _generate_swagger_object(document, links, compact, workers)
+        return force_bytes(_dump_json(data, compact))
+
+    def decode_shards(self, bytes, load_shard, sections=None, **options):
+        """
+        Takes the bytestring of a sharded index, and returns a document.
+
+        `load_shard` is called with the name of each required shard,
+        and should return the bytestring for that shard. Any `max_bytes`
+        limit applies to the index and to each shard separately.
+        """
+        limits = _get_limits(options)
+        max_bytes = options.get('max_bytes')
+        index = _load_json(bytes, max_bytes, limits)
+
+        def load(name):
+            return _load_json(load_shard(name), max_bytes, limits)
+
+        base_url = options.get('base_url')
+        doc = _parse_sharded_document(index, load, sections, base_url, limits)
+        if not isinstance(doc, Document):
+            raise ParseError('Top level node must be a document.')
+
+        return doc
+
+    def encode_shards(self, document, **options):
+        """
+        Takes a document and returns a tuple of `(index, shards)`, where
+        `index` is a bytestring and `shards` maps each shard name onto
+        a bytestring.
+        """
+        if not isinstance(document, Document):
+            raise TypeError('Expected a `coreapi.Document` instance')
+        compact = options.get('compact', False)
+        index, shards = generate_swagger_shards(document, compact)
+        return (
+            force_bytes(_dump_json(index, compact)),
+            OrderedDict([
+                (name, force_bytes(_dump_json(shard, compact)))
+                for name, shard in shards.items()
+            ])
+        )
+
+    def diff(self, old_bytes, new_bytes, **options):
+        """
+        Takes two bytestrings, and returns a `Diff` of the keys of the links
+        that were added, removed, or modified between them. Any limits
+        apply to each spec separately, except for the `timeout`, which
+        covers both.
+        """
+        base_url = options.get('base_url')
+        max_bytes = options.get('max_bytes')
+        old_limits = _get_limits(options)
+        new_limits = _get_limits(options)
+        new_limits.deadline = old_limits.deadline
+        old = get_spec_hashes(_load_json(old_bytes, max_bytes, old_limits), base_url, old_limits)
+        new = get_spec_hashes(_load_json(new_bytes, max_bytes, new_limits), base_url, new_limits)
+        return diff_spec_hashes(old, new)
+
+
+def _dump_json(data, compact=False):
+    if compact:
+        return json.dumps(data, separators=COMPACT_SEPARATORS)
+    return json.dumps(data)
+
+
+def _get_limits(options):
+    return Limits(
+        max_operations=options.get('max_operations'),
+        max_parameters=options.get('max_parameters'),
+        max_ref_depth=options.get('max_ref_depth'),
+        timeout=options.get('timeout')
+    )
+
+
+def _load_json(bytes, max_bytes=None, limits=None):
+    if max_bytes is not None and len(bytes) > max_bytes:
+        raise ParseError('Input is too large. The limit is %d bytes.' % max_bytes)
+    try:
+        data = json.loads(bytes.decode('utf-8'))
+    except ValueError as exc:
+        raise ParseError('Malformed JSON. %s' % exc)
+    if limits is not None:
+        # Parsing cannot be interrupted, but still counts towards the timeout.
+        limits.check_time()
+    return data
@@ -0,0 +1,156 @@
+from coreapi.codecs import CoreJSONCodec
+from openapi_codec import OpenAPICodec, __version__
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+
+MANIFEST = '.openapi-codec.json'
+
+COMMANDS = {
+    # command: (input codec, output codec)
+    'decode': (OpenAPICodec, CoreJSONCodec),
+    'encode': (CoreJSONCodec, OpenAPICodec),
+    'roundtrip': (OpenAPICodec, OpenAPICodec),
+}
+
+
+def main(argv=None):
+    """
+    Convert every `.json` file in a directory, writing the results to
+    another directory, and print a timing summary.
+    """
+    parser = argparse.ArgumentParser(prog='openapi-codec', description=(
+        "Bulk convert schemas. 'decode' converts OpenAPI to Core JSON, "
+        "'encode' converts Core JSON to OpenAPI, and 'roundtrip' normalizes "
+        "OpenAPI schemas."
+    ))
+    parser.add_argument('command', choices=sorted(COMMANDS.keys()))
+    parser.add_argument('source', help='Directory of input schemas.')
+    parser.add_argument('destination', help='Directory to write output schemas to.')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='Number of worker processes. Defaults to the number of CPUs.')
+    parser.add_argument('--force', action='store_true',
+                        help='Convert all inputs, including those that are unchanged.')
+    args = parser.parse_args(argv)
+
+    _makedirs(args.destination)
+    manifest_path = os.path.join(args.destination, MANIFEST)
+    manifest = {}
+    if not args.force and os.path.exists(manifest_path):
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+
+    tasks = [
+        (args.command, args.source, args.destination, path, manifest.get(path))
+        for path in _get_input_paths(args.source)
+    ]
+
+    start = time.time()
+    if args.workers > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(args.workers)
+        results = pool.imap_unordered(_convert, tasks)
+    else:
+        pool = None
+        results = (_convert(task) for task in tasks)
+
+    counts = {'converted': 0, 'skipped': 0, 'failed': 0}
+    total_bytes = 0
+    new_manifest = {}
+    try:
+        for path, digest, status, elapsed, size in results:
+            counts[status] += 1
+            total_bytes += size
+            if status != 'failed':
+                new_manifest[path] = {
+                    'digest': digest,
+                    'command': args.command,
+                    'version': __version__
+                }
+            print('%-9s %8.1fms %10d  %s' % (status, elapsed * 1000, size, path))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    elapsed = time.time() - start
+
+    with open(manifest_path, 'w') as manifest_file:
+        json.dump(new_manifest, manifest_file, indent=2, sort_keys=True)
+
+    print('%d files: %d converted, %d skipped, %d failed' % (
+        len(tasks), counts['converted'], counts['skipped'], counts['failed']
+    ))
+    print('%.2fs total, %.1f files/s, %.2f MB/s' % (
+        elapsed,
+        len(tasks) / elapsed if elapsed else 0.0,
+        total_bytes / elapsed / 1000000 if elapsed else 0.0
+    ))
+    return 1 if counts['failed'] else 0
+
+
+def _get_input_paths(source):
+    """
+    Return the paths of all `.json` files in a directory, relative to it.
+    """
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(source):
+        for filename in filenames:
+            if filename.endswith('.json') and filename != MANIFEST:
+                path = os.path.join(dirpath, filename)
+                paths.append(os.path.relpath(path, source))
+    return sorted(paths)
+
+
+def _convert(task):
+    """
+    Convert a single file, returning `(path, digest, status, elapsed, size)`.
+    Runs in a worker process.
+
+    The file is skipped if its manifest entry from the previous run has the
+    same digest, and was written by the same command and codec version.
+    """
+    command, source, destination, path, previous = task
+    start = time.time()
+    input_path = os.path.join(source, path)
+    output_path = os.path.join(destination, path)
+    digest = None
+    content = b''
+
+    decoder, encoder = COMMANDS[command]
+    try:
+        with open(input_path, 'rb') as input_file:
+            content = input_file.read()
+        digest = hashlib.sha1(content).hexdigest()
+
+        entry = {'digest': digest, 'command': command, 'version': __version__}
+        if previous == entry and os.path.exists(output_path):
+            return (path, digest, 'skipped', time.time() - start, 0)
+
+        document = decoder().decode(content)
+        output = encoder().encode(document)
+
+        _makedirs(os.path.dirname(output_path))
+        with open(output_path, 'wb') as output_file:
+            output_file.write(output)
+    except Exception as exc:
+        sys.stderr.write('%s: %s\n' % (path, exc))
+        return (path, digest, 'failed', time.time() - start, len(content))
+
+    return (path, digest, 'converted', time.time() - start, len(content))
+
+
+def _makedirs(path):
+    # Other workers may be creating the same directory concurrently.
+    try:
+        os.makedirs(path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,103 +1,54 @@
+from collections import namedtuple
 from coreapi import Document, Link, Field
 from coreapi.compat import string_types, urlparse
 from coreapi.exceptions import ParseError
 import coreschema
+import time
 
+try:
+    from types import MappingProxyType
+except ImportError:  # Python 2
+    from collections import Mapping
 
-def _parse_document(data, base_url=None):
+    class MappingProxyType(Mapping):
+        """
+        A read-only view of a mapping. Not a `dict` subclass, so it cannot
+        be changed through `dict` methods either.
+        """
+        def __init__(self, mapping):
+            self._mapping = mapping
+
+        def __getitem__(self, key):
+            return self._mapping[key]
+
+        def __iter__(self):
+            return iter(self._mapping)
+
+        def __len__(self):
+            return len(self._mapping)
+
+
+ACTIONS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch')
+
+
+def _parse_document(data, base_url=None, limits=None, zero_copy=False):
+    access = ZERO_COPY if zero_copy else COPYING
     schema_url = base_url
     base_url = _get_document_base_url(data, base_url)
-    info = _get_dict(data, 'info')
+    info = access.get_dict(data, 'info')
     title = _get_string(info, 'title')
     description = _get_string(info, 'description')
-    consumes = get_strings(_get_list(data, 'consumes'))
-    paths = _get_dict(data, 'paths')
+    consumes = access.get_strings(access.get_list(data, 'consumes'))
+    paths = access.get_dict(data, 'paths')
     content = {}
+    interned = {}
     for path in paths.keys():
-        url = base_url + path.lstrip('/')
-        spec = _get_dict(paths, path)
-        default_parameters = get_dicts(_get_list(spec, 'parameters'))
-        for action in spec.keys():
-            action = action.lower()
-            if action not in ('get', 'put', 'post', 'delete', 'options', 'head', 'patch'):
-                continue
-            operation = _get_dict(spec, action)
-
-            # Determine any fields on the link.
-            has_body = False
-            has_form = False
-
-            fields = []
-            parameters = get_dicts(_get_list(operation, 'parameters', default_parameters), dereference_using=data)
-            for parameter in parameters:
-                name = _get_string(parameter, 'name')
-                location = _get_string(parameter, 'in')
-                required = _get_bool(parameter, 'required', default=(location == 'path'))
-                if location == 'body':
-                    has_body = True
-                    schema = _get_dict(parameter, 'schema', dereference_using=data)
-                    expanded = _expand_schema(schema)
-                    if expanded is not None:
-                        # TODO: field schemas.
-                        expanded_fields = [
-                            Field(
-                                name=field_name,
-                                location='form',
-                                required=is_required,
-                                schema=coreschema.String(description=field_description)
-                            )
-                            for field_name, is_required, field_description in expanded
-                            if not any([field.name == field_name for field in fields])
-                        ]
-                        fields += expanded_fields
-                    else:
-                        # TODO: field schemas.
-                        field_description = _get_string(parameter, 'description')
-                        field = Field(
-                            name=name,
-                            location='body',
-                            required=required,
-                            schema=coreschema.String(description=field_description)
-                        )
-                        fields.append(field)
-                else:
-                    if location == 'formData':
-                        has_form = True
-                        location = 'form'
-                    field_description = _get_string(parameter, 'description')
-                    # TODO: field schemas.
-                    field = Field(
-                        name=name,
-                        location=location,
-                        required=required,
-                        schema=coreschema.String(description=field_description)
-                    )
-                    fields.append(field)
-
-            link_consumes = get_strings(_get_list(operation, 'consumes', consumes))
-            encoding = ''
-            if has_body:
-                encoding = _select_encoding(link_consumes)
-            elif has_form:
-                encoding = _select_encoding(link_consumes, form=True)
-
-            link_title = _get_string(operation, 'summary')
-            link_description = _get_string(operation, 'description')
-            link = Link(url=url, action=action, encoding=encoding, fields=fields, title=link_title, description=link_description)
-
-            # Add the link to the document content.
-            tags = get_strings(_get_list(operation, 'tags'))
-            operation_id = _get_string(operation, 'operationId')
-            if tags:
-                tag = tags[0]
-                prefix = tag + '_'
-                if operation_id.startswith(prefix):
-                    operation_id = operation_id[len(prefix):]
-                if tag not in content:
-                    content[tag] = {}
-                content[tag][operation_id] = link
-            else:
-                content[operation_id] = link
+        spec = access.get_dict(paths, path)
+        links = _parse_path_item(
+            data, base_url, consumes, path, spec, interned, limits, zero_copy=zero_copy
+        )
+        for keys, link in links:
+            _add_link(content, keys, link)
 
     return Document(
         url=schema_url,
@@ -108,6 +59,240 @@ def _parse_document(data, base_url=None):
     )
 
 
+def _parse_path_item(data, base_url, consumes, path, spec, interned=None, limits=None,
+                     link_class=Link, get_field=None, zero_copy=False):
+    """
+    Return a list of `(keys, link)` for the operations in a single path item.
+
+    Identical fields and strings are shared using the `interned` dict, which
+    may be shared between calls. If `limits` is provided, then a `ParseError`
+    is raised as soon as any of them are exceeded.
+
+    `link_class` and `get_field` may be used to construct alternative link
+    and field types, which must provide the same attributes.
+
+    If `zero_copy` is set, then the spec is read using the zero-copy helper
+    functions, which avoid allocating copies of the input.
+    """
+    access = ZERO_COPY if zero_copy else COPYING
+    if get_field is None:
+        get_field = _get_field
+    if interned is None:
+        interned = {}
+    if limits is None:
+        limits = Limits()
+    url = _intern(interned, base_url + path.lstrip('/'))
+    default_parameters = access.get_dicts(access.get_list(spec, 'parameters'))
+    links = []
+    for action in spec.keys():
+        action = _intern(interned, action.lower())
+        if action not in ACTIONS:
+            continue
+        operation = access.get_dict(spec, action)
+        limits.check_operation()
+
+        # Determine any fields on the link.
+        has_body = False
+        has_form = False
+
+        fields = []
+        field_names = set()
+        parameters = access.get_list(operation, 'parameters', default_parameters)
+        limits.check_parameters(len(parameters))
+        limits.check_refs(parameters)
+        parameters = access.get_dicts(parameters, dereference_using=data)
+        for parameter in parameters:
+            limits.check_time()
+            name = _get_string(parameter, 'name')
+            location = _get_string(parameter, 'in')
+            required = _get_bool(parameter, 'required', default=(location == 'path'))
+            if location == 'body':
+                has_body = True
+                limits.check_refs([parameter.get('schema')])
+                schema = access.get_dict(parameter, 'schema', dereference_using=data)
+                expanded = _expand_schema(schema, access)
+                if expanded is not None:
+                    expanded_fields = [
+                        get_field(interned, field_name, 'form', is_required, field_description)
+                        for field_name, is_required, field_description in expanded
+                        if field_name not in field_names
+                    ]
+                    limits.check_parameters(len(fields) + len(expanded_fields))
+                    fields += expanded_fields
+                    field_names.update([field.name for field in expanded_fields])
+                else:
+                    field_description = _get_string(parameter, 'description')
+                    field = get_field(interned, name, 'body', required, field_description)
+                    fields.append(field)
+                    field_names.add(name)
+            else:
+                if location == 'formData':
+                    has_form = True
+                    location = 'form'
+                field_description = _get_string(parameter, 'description')
+                field = get_field(interned, name, location, required, field_description)
+                fields.append(field)
+                field_names.add(name)
+
+        # Fields added after an expanded body have not been counted yet.
+        limits.check_parameters(len(fields))
+
+        link_consumes = access.get_strings(access.get_list(operation, 'consumes', consumes))
+        encoding = ''
+        if has_body:
+            encoding = _select_encoding(link_consumes)
+        elif has_form:
+            encoding = _select_encoding(link_consumes, form=True)
+
+        encoding = _intern(interned, encoding)
+        link_title = _intern(interned, _get_string(operation, 'summary'))
+        link_description = _intern(interned, _get_string(operation, 'description'))
+        link = link_class(url=url, action=action, encoding=encoding, fields=fields, title=link_title, description=link_description)
+
+        links.append((_get_link_keys(operation, access), link))
+
+    return links
+
+
+class Limits(object):
+    """
+    Resource limits for decoding untrusted specs. Any limit that is `None`
+    is not enforced.
+
+    * `max_operations` - The maximum number of operations in the spec.
+    * `max_parameters` - The maximum number of parameters for any one
+      operation, including expanded body schema properties.
+    * `max_ref_depth` - The maximum number of path segments in a `$ref`.
+    * `timeout` - The maximum number of seconds to spend decoding, counted
+      from when the limits are created. The deadline is checked between
+      each parameter, so parsing the JSON itself can only be bounded by
+      limiting the size of the input.
+    """
+    def __init__(self, max_operations=None, max_parameters=None, max_ref_depth=None, timeout=None):
+        self.max_operations = max_operations
+        self.max_parameters = max_parameters
+        self.max_ref_depth = max_ref_depth
+        self.deadline = None if (timeout is None) else time.time() + timeout
+        self.timeout = timeout
+        self.operations = 0
+
+    def check_operation(self):
+        self.operations += 1
+        if self.max_operations is not None and self.operations > self.max_operations:
+            raise ParseError('Too many operations. The limit is %d.' % self.max_operations)
+        self.check_time()
+
+    def check_parameters(self, count):
+        if self.max_parameters is not None and count > self.max_parameters:
+            raise ParseError('Too many parameters for an operation. The limit is %d.' % self.max_parameters)
+        self.check_time()
+
+    def check_time(self):
+        if self.deadline is not None and time.time() > self.deadline:
+            raise ParseError('Decoding took longer than the limit of %s seconds.' % self.timeout)
+
+    def check_refs(self, items):
+        if self.max_ref_depth is None:
+            return
+        for item in items:
+            if is_json_pointer(item) and isinstance(item['$ref'], string_types):
+                depth = len(item['$ref'].strip('#/').split('/'))
+                if depth > self.max_ref_depth:
+                    raise ParseError('JSON pointer is too deep. The limit is %d.' % self.max_ref_depth)
+
+
+def _get_field(interned, name, location, required, description):
+    """
+    Return a `Field`, reusing any structurally identical field or schema
+    previously stored in `interned`.
+    """
+    if not (description is None or isinstance(description, string_types)):
+        # Unhashable values from a malformed spec are not interned.
+        return Field(
+            name=name,
+            location=location,
+            required=required,
+            schema=coreschema.String(description=description)
+        )
+
+    key = ('field', name, location, required, description)
+    field = interned.get(key)
+    if field is None:
+        schema_key = ('schema', description)
+        schema = interned.get(schema_key)
+        if schema is None:
+            # TODO: field schemas.
+            schema = coreschema.String(description=_intern(interned, description))
+            interned[schema_key] = schema
+        field = Field(
+            name=_intern(interned, name),
+            location=_intern(interned, location),
+            required=required,
+            schema=schema
+        )
+        interned[key] = field
+    return field
+
+
+def _intern(interned, value):
+    """
+    Return a previously stored value equal to `value`, or store it.
+    """
+    return interned.setdefault(value, value)
+
+
+def _get_link_keys(operation, access=None):
+    """
+    Return the keys that a link is placed at, within the document content.
+    """
+    if access is None:
+        access = COPYING
+    tags = access.get_strings(access.get_list(operation, 'tags'))
+    operation_id = _get_string(operation, 'operationId')
+    if tags:
+        tag = tags[0]
+        prefix = tag + '_'
+        if operation_id.startswith(prefix):
+            operation_id = operation_id[len(prefix):]
+        return (tag, operation_id)
+    return (operation_id,)
+
+
+def _add_link(content, keys, link):
+    if len(keys) > 1:
+        tag, operation_id = keys
+        if tag not in content:
+            content[tag] = {}
+        content[tag][operation_id] = link
+    else:
+        content[keys[0]] = link
+
+
+def _parse_sharded_document(index, load_shard, sections=None, base_url=None, limits=None):
+    """
+    Parse a sharded Swagger spec, as generated by `generate_swagger_shards`.
+
+    Only the shards named in `sections` are loaded, using the `load_shard`
+    callable, which takes a shard name and returns the parsed fragment.
+    If `sections` is `None` then every shard listed in the index is loaded.
+    """
+    names = get_strings(_get_list(index, 'x-shards'))
+    if sections is not None:
+        names = [name for name in names if name in sections]
+
+    paths = {}
+    for fragment in [index] + [load_shard(name) for name in names]:
+        fragment_paths = _get_dict(fragment, 'paths')
+        for path in fragment_paths.keys():
+            if path not in paths:
+                paths[path] = {}
+            paths[path].update(_get_dict(fragment_paths, path))
+
+    data = dict(index)
+    data['paths'] = paths
+    return _parse_document(data, base_url, limits)
+
+
 def _get_document_base_url(data, base_url=None):
     """
     Get the base url to use when constructing absolute paths from the
@@ -178,14 +363,16 @@ def _select_encoding(consumes, form=False):
     return consumes[0]
 
 
-def _expand_schema(schema):
+def _expand_schema(schema, access=None):
     """
     When an OpenAPI parameter uses `in="body"`, and the schema type is "object",
     then we expand out the parameters of the object into individual fields.
     """
+    if access is None:
+        access = COPYING
     schema_type = schema.get('type')
-    schema_properties = _get_dict(schema, 'properties')
-    schema_required = _get_list(schema, 'required')
+    schema_properties = access.get_dict(schema, 'properties')
+    schema_required = set(access.get_strings(access.get_list(schema, 'required')))
     if ((schema_type == ['object']) or (schema_type == 'object')) and schema_properties:
         return [
             (key, key in schema_required, schema_properties[key].get('description'))
@@ -250,3 +437,58 @@ def get_dicts(item, dereference_using=None):
 
 def get_strings(item):
     return [value for value in item if isinstance(value, string_types)]
+
+
+# Zero-copy versions of the helper functions, used by `zero_copy` decoding.
+# These return the input itself whenever possible, and a shared read-only
+# empty default for missing values, so the results must never be modified.
+
+EMPTY_DICT = MappingProxyType({})
+EMPTY_LIST = ()
+
+
+def _get_dict_view(item, key, default=EMPTY_DICT, dereference_using=None):
+    value = item.get(key)
+    if isinstance(value, dict):
+        if dereference_using and is_json_pointer(value):
+            return dereference(value['$ref'], dereference_using)
+        return value
+    return default
+
+
+def _get_list_view(item, key, default=EMPTY_LIST):
+    value = item.get(key)
+    return value if isinstance(value, list) else default
+
+
+def get_dicts_view(item, dereference_using=None):
+    ret = None
+    for index, value in enumerate(item):
+        if isinstance(value, dict) and not (dereference_using and is_json_pointer(value)):
+            if ret is not None:
+                ret.append(value)
+            continue
+        if ret is None:
+            # Copy the items seen so far, the first time one needs changing.
+            ret = list(item[:index])
+        if isinstance(value, dict):
+            ret.append(dereference(value['$ref'], dereference_using))
+    return item if ret is None else ret
+
+
+def get_strings_view(item):
+    ret = None
+    for index, value in enumerate(item):
+        if isinstance(value, string_types):
+            if ret is not None:
+                ret.append(value)
+        elif ret is None:
+            ret = list(item[:index])
+    return item if ret is None else ret
+
+
+# The helper functions used by `_parse_path_item`, for each decoding mode.
+_Accessors = namedtuple('_Accessors', ['get_dict', 'get_list', 'get_dicts', 'get_strings'])
+
+COPYING = _Accessors(_get_dict, _get_list, get_dicts, get_strings)
+ZERO_COPY = _Accessors(_get_dict_view, _get_list_view, get_dicts_view, get_strings_view)
@@ -0,0 +1,259 @@
+from collections import namedtuple, OrderedDict
+from coreapi.compat import force_bytes, string_types
+from openapi_codec.decode import (
+    ACTIONS, Limits, _get_document_base_url, _get_link_keys, _get_dict,
+    _get_list, dereference, get_dicts, get_strings, is_json_pointer
+)
+import hashlib
+import json
+
+
+# A Merkle tree over a spec: `paths` -> methods -> operations.
+SpecHashes = namedtuple('SpecHashes', ['hash', 'paths'])
+PathHashes = namedtuple('PathHashes', ['hash', 'operations'])
+OperationHash = namedtuple('OperationHash', ['hash', 'keys'])
+
+Diff = namedtuple('Diff', ['added', 'removed', 'modified'])
+
+# The operation keys that are used when decoding a link.
+LINK_KEYS = ('operationId', 'tags', 'summary', 'description', 'consumes', 'parameters')
+
+
+def get_spec_hashes(data, base_url=None, limits=None):
+    """
+    Returns a `SpecHashes` tree for a parsed Swagger spec.
+
+    Each operation is hashed over the parts of the spec that affect the
+    link it decodes to, including any `$ref` objects that it depends on.
+    If `limits` is provided, then a `ParseError` is raised as soon as one
+    of them is exceeded, as when decoding.
+    """
+    base_url = _get_document_base_url(data, base_url)
+    consumes = get_strings(_get_list(data, 'consumes'))
+    refs = RefHashes(data, limits)
+    paths = _get_dict(data, 'paths')
+    path_hashes = OrderedDict()
+    for path in paths.keys():
+        spec = _get_dict(paths, path)
+        path_hashes[path] = get_path_hashes(data, base_url, consumes, path, spec, refs, limits)
+    return SpecHashes(
+        _hash_children(path_hashes),
+        path_hashes
+    )
+
+
+def get_path_hashes(data, base_url, consumes, path, spec, refs=None, limits=None):
+    """
+    Returns a `PathHashes` node for a single path item.
+
+    `refs` is a `RefHashes` instance, which may be shared between calls.
+    """
+    if refs is None:
+        refs = RefHashes(data, limits)
+    if limits is None:
+        limits = Limits()
+    url = base_url + path.lstrip('/')
+    default_parameters = get_dicts(_get_list(spec, 'parameters'))
+    operations = OrderedDict()
+    for action in spec.keys():
+        # Operations are read using the lowercased method, as when decoding.
+        action = action.lower()
+        if action not in ACTIONS:
+            continue
+        operation = _get_dict(spec, action)
+        limits.check_operation()
+        parameters = _get_list(operation, 'parameters', default_parameters)
+        limits.check_parameters(len(parameters))
+        limits.check_refs(parameters)
+        if limits.max_ref_depth is not None:
+            # Body schemas are dereferenced when decoding, so check them too.
+            limits.check_refs([
+                parameter.get('schema')
+                for parameter in get_dicts(parameters, dereference_using=data)
+                if parameter.get('in') == 'body'
+            ])
+        link_content = {
+            key: operation[key] for key in LINK_KEYS if key in operation
+        }
+        content = [url, consumes, default_parameters, action, link_content]
+        operations[action] = OperationHash(
+            refs.hash_content(content),
+            _get_link_keys(operation)
+        )
+    return PathHashes(
+        _hash_children(operations),
+        operations
+    )
+
+
+class RefHashes(object):
+    """
+    Merkle hashes for the targets of the JSON pointers in a spec.
+
+    Each target is serialized once, with any nested `$ref` objects left in
+    place, and its hash combines that with the hashes of the targets it
+    references. References are grouped into strongly connected components,
+    so that recursive references hash the same way whichever pointer is
+    reached first.
+    """
+    def __init__(self, data, limits=None):
+        self.data = data
+        self.limits = Limits() if (limits is None) else limits
+        self.hashes = {}
+        self._local = {}
+        self._refs = {}
+
+    def hash_content(self, content):
+        """
+        Return the hash of `content`, combined with the hashes of the
+        targets of any JSON pointers within it.
+        """
+        text = json.dumps(content, sort_keys=True)
+        pointers = sorted(set(_get_pointers(content)))
+        ref_hashes = ['%s %s' % (pointer, self.get_hash(pointer)) for pointer in pointers]
+        return _hash_text('\n'.join([text] + ref_hashes))
+
+    def get_hash(self, pointer):
+        if pointer not in self.hashes:
+            self._hash_components(pointer)
+        return self.hashes[pointer]
+
+    def _get_local(self, pointer):
+        """
+        Return the hash of a pointer's target, with nested references left
+        in place, and store the pointers that the target references.
+        """
+        if pointer not in self._local:
+            self.limits.check_time()
+            target = dereference(pointer, self.data)
+            if not isinstance(target, dict):
+                target = {}
+            self._local[pointer] = _hash_text(json.dumps(target, sort_keys=True))
+            self._refs[pointer] = sorted(set(_get_pointers(target)))
+        return self._local[pointer]
+
+    def _get_refs(self, pointer):
+        self._get_local(pointer)
+        return self._refs[pointer]
+
+    def _hash_components(self, root):
+        """
+        Hash every pointer reachable from `root`, using an iterative form of
+        Tarjan's algorithm. Components are completed in reverse topological
+        order, so every component they reference has already been hashed.
+        """
+        index = {root: 0}
+        lowlink = {root: 0}
+        stack = [root]
+        on_stack = set([root])
+        work = [(root, iter(self._get_refs(root)))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child in self.hashes:
+                    continue
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(self._get_refs(child))))
+                    break
+                elif child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == node:
+                            break
+                    self._hash_component(members)
+
+    def _hash_component(self, members):
+        member_set = set(members)
+        lines = sorted([
+            '%s %s' % (member, self._get_local(member)) for member in members
+        ])
+        lines += sorted(set([
+            '%s %s' % (ref, self.hashes[ref])
+            for member in members
+            for ref in self._get_refs(member)
+            if ref not in member_set
+        ]))
+        component_hash = _hash_text('\n'.join(lines))
+        for member in members:
+            self.hashes[member] = _hash_text(member + ' ' + component_hash)
+
+
+def diff_spec_hashes(old, new):
+    """
+    Compare two `SpecHashes` trees, returning a `Diff` of the link keys
+    that were added, removed, or modified.
+
+    Only the subtrees with differing hashes are visited.
+    """
+    if old.hash == new.hash:
+        return Diff([], [], [])
+
+    old_links = {}
+    new_links = {}
+    for path in set(old.paths.keys()) | set(new.paths.keys()):
+        old_path = old.paths.get(path)
+        new_path = new.paths.get(path)
+        if old_path is not None and new_path is not None and old_path.hash == new_path.hash:
+            continue
+        old_operations = {} if old_path is None else old_path.operations
+        new_operations = {} if new_path is None else new_path.operations
+        for method in set(old_operations.keys()) | set(new_operations.keys()):
+            old_operation = old_operations.get(method)
+            new_operation = new_operations.get(method)
+            if old_operation == new_operation:
+                continue
+            if old_operation is not None:
+                old_links[old_operation.keys] = old_operation.hash
+            if new_operation is not None:
+                new_links[new_operation.keys] = new_operation.hash
+
+    added = set(new_links.keys()) - set(old_links.keys())
+    removed = set(old_links.keys()) - set(new_links.keys())
+    modified = [
+        keys for keys in set(old_links.keys()) & set(new_links.keys())
+        if old_links[keys] != new_links[keys]
+    ]
+    return Diff(sorted(added), sorted(removed), sorted(modified))
+
+
+def _get_pointers(node):
+    """
+    Return a list of the JSON pointers within a node.
+    """
+    if isinstance(node, dict):
+        if is_json_pointer(node) and isinstance(node['$ref'], string_types):
+            return [node['$ref']]
+        pointers = []
+        for value in node.values():
+            pointers.extend(_get_pointers(value))
+        return pointers
+    elif isinstance(node, (list, tuple)):
+        pointers = []
+        for value in node:
+            pointers.extend(_get_pointers(value))
+        return pointers
+    return []
+
+
+def _hash_text(text):
+    return hashlib.sha1(force_bytes(text)).hexdigest()
+
+
+def _hash_children(children):
+    text = '\n'.join([
+        '%s %s' % (key, child.hash) for key, child in children.items()
+    ])
+    return _hash_text(text)
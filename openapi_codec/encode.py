@@ -1,12 +1,19 @@
 import coreschema
+import multiprocessing
 from collections import OrderedDict
 from coreapi.compat import urlparse
 from openapi_codec.utils import get_method, get_encoding, get_location, get_links_from_document
 
 
-def generate_swagger_object(document):
+def generate_swagger_object(document, compact=False, workers=None):
     """
     Generates root of the Swagger spec.
+
+    If `compact` is set, then optional keys are omitted wherever they would
+    only contain their default values.
+
+    If `workers` is greater than one, then the operations for each top-level
+    section are generated in a pool of that many processes.
     """
     parsed_url = urlparse.urlparse(document.url)
 
@@ -15,7 +22,8 @@ def generate_swagger_object(document):
     swagger['swagger'] = '2.0'
     swagger['info'] = OrderedDict()
     swagger['info']['title'] = document.title
-    swagger['info']['description'] = document.description
+    if document.description or not compact:
+        swagger['info']['description'] = document.description
     swagger['info']['version'] = ''  # Required by the spec
 
     if parsed_url.netloc:
@@ -23,11 +31,50 @@ def generate_swagger_object(document):
     if parsed_url.scheme:
         swagger['schemes'] = [parsed_url.scheme]
 
-    swagger['paths'] = _get_paths_object(document)
+    swagger['paths'] = _get_paths_object(document, compact, workers)
 
     return swagger
 
 
+def generate_swagger_shards(document, compact=False):
+    """
+    Generates a Swagger index object, plus one Swagger fragment for each
+    top-level section of the document.
+
+    Operations that are not within a section remain in the index. The index
+    lists the names of the fragments under `x-shards`, and each fragment is
+    itself a complete Swagger spec.
+    """
+    swagger = generate_swagger_object(document, compact)
+
+    index = OrderedDict([
+        (key, value) for key, value in swagger.items() if key != 'paths'
+    ])
+    index['paths'] = OrderedDict()
+
+    shards = OrderedDict()
+    for url, path_item in swagger['paths'].items():
+        for method, operation in path_item.items():
+            tags = operation.get('tags')
+            if tags:
+                if tags[0] not in shards:
+                    shard = OrderedDict([
+                        (key, value) for key, value in index.items() if key != 'paths'
+                    ])
+                    shard['paths'] = OrderedDict()
+                    shards[tags[0]] = shard
+                paths = shards[tags[0]]['paths']
+            else:
+                paths = index['paths']
+            if url not in paths:
+                paths[url] = OrderedDict()
+            paths[url][method] = operation
+
+    index['x-shards'] = list(shards.keys())
+
+    return index, shards
+
+
 def _add_tag_prefix(item):
     operation_id, link, tags = item
     if tags:
@@ -39,9 +86,17 @@ def _get_links(document):
     """
     Return a list of (operation_id, link, [tags])
     """
+    return _get_links_from_items(get_links_from_document(document))
+
+
+def _get_links_from_items(items):
+    """
+    Return a list of (operation_id, link, [tags]), given the sorted list
+    of (keys, link) returned by `get_links_from_document`.
+    """
     # Extract all the links from the first or second level of the document.
     links = []
-    for keys, link in get_links_from_document(document):
+    for keys, link in items:
         if len(keys) > 1:
             operation_id = '_'.join(keys[1:])
             tags = [keys[0]]
@@ -61,31 +116,89 @@ def _get_links(document):
     return links
 
 
-def _get_paths_object(document):
+def _get_paths_object(document, compact=False, workers=None):
+    return _get_paths_object_from_links(_get_links(document), compact, workers)
+
+
+def _get_paths_object_from_links(links, compact=False, workers=None):
     paths = OrderedDict()
 
-    links = _get_links(document)
+    if workers is not None and workers > 1:
+        operations = _get_operations_in_parallel(links, compact, workers)
+    else:
+        operations = _get_operations(links, compact)
 
-    for operation_id, link, tags in links:
+    for (operation_id, link, tags), operation in zip(links, operations):
         if link.url not in paths:
             paths[link.url] = OrderedDict()
 
         method = get_method(link)
-        operation = _get_operation(operation_id, link, tags)
         paths[link.url].update({method: operation})
 
     return paths
 
 
-def _get_operation(operation_id, link, tags):
+def _get_operations(links, compact=False):
+    """
+    Return a list of operations, one for each `(operation_id, link, tags)`.
+    """
+    # In compact mode, identical responses objects are shared between operations.
+    responses = {} if compact else None
+
+    return [
+        _get_operation(operation_id, link, tags, compact, responses)
+        for operation_id, link, tags in links
+    ]
+
+
+def _get_operations_in_parallel(links, compact, workers):
+    """
+    Return the same list of operations as `_get_operations`, but partition
+    the links by top-level section, and generate each section in a pool.
+    """
+    sections = OrderedDict()
+    for index, (operation_id, link, tags) in enumerate(links):
+        section = tags[0] if tags else ''
+        if section not in sections:
+            sections[section] = []
+        sections[section].append(index)
+
+    tasks = [
+        ([links[index] for index in indexes], compact)
+        for indexes in sections.values()
+    ]
+    if not tasks:
+        return []
+
+    pool = multiprocessing.Pool(min(workers, len(tasks)))
+    try:
+        results = pool.map(_get_section_operations, tasks)
+    finally:
+        pool.close()
+        pool.join()
+
+    operations = [None] * len(links)
+    for indexes, section_operations in zip(sections.values(), results):
+        for index, operation in zip(indexes, section_operations):
+            operations[index] = operation
+    return operations
+
+
+def _get_section_operations(task):
+    # Runs in a worker process.
+    links, compact = task
+    return _get_operations(links, compact)
+
+
+def _get_operation(operation_id, link, tags, compact=False, responses=None):
     encoding = get_encoding(link)
     description = link.description.strip()
     summary = description.splitlines()[0] if description else None
 
     operation = {
         'operationId': operation_id,
-        'responses': _get_responses(link),
-        'parameters': _get_parameters(link, encoding)
+        'responses': _get_responses(link, responses),
+        'parameters': _get_parameters(link, encoding, compact)
     }
 
     if description:
@@ -128,7 +241,7 @@ def _get_field_type(field):
     }.get(field.schema.__class__, 'string')
 
 
-def _get_parameters(link, encoding):
+def _get_parameters(link, encoding, compact=False):
     """
     Generates Swagger Parameter Item object.
     """
@@ -205,17 +318,42 @@ def _get_parameters(link, encoding):
             parameter['schema']['required'] = required
         parameters.append(parameter)
 
+    if compact:
+        # Schema properties keep their descriptions, as decoding treats a
+        # missing property description differently to an empty one.
+        for parameter in parameters:
+            _compact_parameter(parameter)
+
     return parameters
 
 
-def _get_responses(link):
+def _compact_parameter(parameter):
+    """
+    Remove any keys that only contain their default values.
+    """
+    if not parameter.get('description'):
+        parameter.pop('description', None)
+    if parameter.get('required') is False and parameter.get('in') != 'path':
+        del parameter['required']
+
+
+def _get_responses(link, cache=None):
     """
     Returns minimally acceptable responses object based
     on action / method type.
+
+    If a `cache` dict is provided, then the same responses object is
+    returned for every link with the same status code.
     """
-    template = {'description': ''}
     if link.action.lower() == 'post':
-        return {'201': template}
-    if link.action.lower() == 'delete':
-        return {'204': template}
-    return {'200': template}
+        status = '201'
+    elif link.action.lower() == 'delete':
+        status = '204'
+    else:
+        status = '200'
+
+    if cache is None:
+        return {status: {'description': ''}}
+    if status not in cache:
+        cache[status] = {status: {'description': ''}}
+    return cache[status]
@@ -0,0 +1,162 @@
+from collections import namedtuple, OrderedDict
+from coreapi import Document
+from coreapi.compat import COMPACT_SEPARATORS, force_bytes, string_types
+from openapi_codec.decode import (
+    Limits, _add_link, _get_dict, _get_document_base_url, _get_list, _get_string,
+    _parse_path_item, get_strings
+)
+from openapi_codec.diff import RefHashes, get_path_hashes
+from openapi_codec.encode import (
+    _get_field_description, _get_field_type, _get_links, _get_operation,
+    generate_swagger_object
+)
+from openapi_codec.utils import get_method
+import copy
+import json
+
+
+# The result of an incremental decode. `paths` maps each path onto a
+# `(PathHashes, [(keys, link), ...])` pair, for reuse by the next decode.
+DecodeResult = namedtuple('DecodeResult', ['document', 'paths'])
+
+
+def _parse_document_incremental(data, base_url=None, previous=None, limits=None):
+    """
+    Parse a Swagger spec, reusing the links from a previous `DecodeResult`
+    for any path items whose content and dependencies have not changed.
+
+    `limits` are enforced for the whole spec, including reused links.
+    """
+    schema_url = base_url
+    base_url = _get_document_base_url(data, base_url)
+    info = _get_dict(data, 'info')
+    title = _get_string(info, 'title')
+    description = _get_string(info, 'description')
+    consumes = get_strings(_get_list(data, 'consumes'))
+    previous_paths = {} if (previous is None) else previous.paths
+    if limits is None:
+        limits = Limits()
+    refs = RefHashes(data, limits)
+    interned = {}
+
+    # Operations are counted while hashing, so not again while parsing.
+    parse_limits = copy.copy(limits)
+    parse_limits.max_operations = None
+
+    paths = _get_dict(data, 'paths')
+    result_paths = OrderedDict()
+    content = {}
+    for path in paths.keys():
+        spec = _get_dict(paths, path)
+        path_hashes = get_path_hashes(data, base_url, consumes, path, spec, refs, limits)
+        previous_path = previous_paths.get(path)
+        if previous_path is not None and previous_path[0].hash == path_hashes.hash:
+            links = previous_path[1]
+            for keys, link in links:
+                limits.check_parameters(len(link.fields))
+        else:
+            links = _parse_path_item(data, base_url, consumes, path, spec, interned, parse_limits)
+        result_paths[path] = (path_hashes, links)
+        for keys, link in links:
+            _add_link(content, keys, link)
+
+    document = Document(
+        url=schema_url,
+        title=title,
+        description=description,
+        content=content,
+        media_type='application/openapi+json'
+    )
+    return DecodeResult(document, result_paths)
+
+
+class IncrementalEncoder(object):
+    """
+    Encodes successive versions of a document, only regenerating the
+    operations whose links have changed since the previous call.
+
+    The output is identical to `OpenAPICodec().encode(document, compact=...)`.
+    """
+    def __init__(self, compact=False):
+        self.compact = compact
+        self.separators = COMPACT_SEPARATORS if compact else (', ', ': ')
+        self._operations = {}
+
+    def encode(self, document):
+        if not isinstance(document, Document):
+            raise TypeError('Expected a `coreapi.Document` instance')
+
+        item_separator, key_separator = self.separators
+        responses = {} if self.compact else None
+        operations = {}
+        paths = OrderedDict()
+
+        for operation_id, link, tags in _get_links(document):
+            fingerprint = _get_fingerprint(operation_id, link, tags)
+            operation = self._operations.get(fingerprint)
+            if operation is None:
+                operation = self._dumps(_get_operation(operation_id, link, tags, self.compact, responses))
+            operations[fingerprint] = operation
+
+            if link.url not in paths:
+                paths[link.url] = OrderedDict()
+            paths[link.url][get_method(link)] = operation
+
+        # Only keep the operations for the current document.
+        self._operations = operations
+
+        paths_content = item_separator.join([
+            self._dumps(url) + key_separator + '{' + item_separator.join([
+                self._dumps(method) + key_separator + operation
+                for method, operation in path_item.items()
+            ]) + '}'
+            for url, path_item in paths.items()
+        ])
+
+        # The paths are always the last key of the root object.
+        swagger = generate_swagger_object(document.clone({}), self.compact)
+        del swagger['paths']
+        root = self._dumps(swagger)
+        return force_bytes(''.join([
+            root[:-1], item_separator, self._dumps('paths'), key_separator,
+            '{', paths_content, '}}'
+        ]))
+
+    def _dumps(self, data):
+        if self.compact:
+            return json.dumps(data, separators=self.separators)
+        return json.dumps(data)
+
+
+def _get_fingerprint(operation_id, link, tags):
+    """
+    Return a hashable value that covers everything used by `_get_operation`.
+    """
+    return (
+        operation_id,
+        tuple(tags),
+        link.action,
+        link.encoding,
+        link.description,
+        tuple([
+            (
+                field.name,
+                field.required,
+                field.location,
+                _get_description_key(_get_field_description(field)),
+                _get_field_type(field)
+            )
+            for field in link.fields
+        ])
+    )
+
+
+def _get_description_key(description):
+    """
+    Return a hashable value for a field description. Unhashable values from
+    a malformed spec are serialized instead, tagged so that they cannot equal
+    a string description.
+    """
+    if description is None or isinstance(description, string_types):
+        return description
+    return ('json', json.dumps(description, sort_keys=True))
@@ -0,0 +1,118 @@
+from collections import namedtuple
+from coreapi import Document
+from coreapi.compat import string_types
+from openapi_codec.decode import (
+    _add_link, _get_dict, _get_document_base_url, _get_list, _get_string,
+    _parse_path_item, get_strings
+)
+from openapi_codec.encode import (
+    _get_links_from_items, _get_paths_object_from_links, generate_swagger_object
+)
+from openapi_codec.utils import link_sorting_key
+
+
+# Lightweight stand-ins for the `Link`, `Field` and `coreschema.String`
+# instances that decoding would create, with the attributes used by encoding.
+_Link = namedtuple('_Link', ['url', 'action', 'encoding', 'fields', 'title', 'description'])
+_Field = namedtuple('_Field', ['name', 'required', 'location', 'schema', 'description', 'type'])
+_Schema = namedtuple('_Schema', ['description'])
+
+
+def normalize_swagger_object(data, base_url=None, compact=False, workers=None):
+    """
+    Takes a parsed Swagger spec, and returns the same result as
+    `generate_swagger_object(_parse_document(data, base_url))`, without
+    creating the intermediate document.
+    """
+    document, links = _parse_links(data, base_url)
+    return _generate_swagger_object(document, links, compact, workers)
+
+
+def _parse_links(data, base_url=None, limits=None):
+    """
+    Returns a tuple of `(document, links)`, where `document` is an empty
+    document with the spec's url, title and description, and `links` is a
+    list of `(operation_id, link, [tags])`, as returned by `_get_links`.
+
+    The links do not reference `data`, so it may be released afterwards.
+    """
+    document, content = _parse_content(data, base_url, limits)
+    links = _get_links_from_items(_get_links_from_content(content))
+    return (document, links)
+
+
+def _parse_content(data, base_url=None, limits=None):
+    """
+    Returns a tuple of `(document, content)`, where `content` holds the
+    links in the same nested dicts as the content of a decoded document.
+    """
+    schema_url = base_url
+    base_url = _get_document_base_url(data, base_url)
+    info = _get_dict(data, 'info')
+    title = _get_string(info, 'title')
+    description = _get_string(info, 'description')
+    consumes = get_strings(_get_list(data, 'consumes'))
+    paths = _get_dict(data, 'paths')
+    content = {}
+    interned = {}
+    for path in paths.keys():
+        spec = _get_dict(paths, path)
+        links = _parse_path_item(
+            data, base_url, consumes, path, spec, interned, limits,
+            link_class=_Link, get_field=_get_field
+        )
+        for keys, link in links:
+            _add_link(content, keys, link)
+
+    document = Document(url=schema_url, title=title, description=description)
+    return (document, content)
+
+
+def _generate_swagger_object(document, links, compact=False, workers=None):
+    # Generate the root object from the empty document, then add the paths.
+    swagger = generate_swagger_object(document, compact)
+    swagger['paths'] = _get_paths_object_from_links(links, compact, workers)
+    return swagger
+
+
+def _get_field(interned, name, location, required, description):
+    """
+    Return a `_Field`, reusing any structurally identical field previously
+    stored in `interned`.
+    """
+    if not (description is None or isinstance(description, string_types)):
+        # Unhashable values from a malformed spec are not interned.
+        return _Field(name, required, location, _Schema(description), None, 'string')
+
+    key = ('_field', name, location, required, description)
+    field = interned.get(key)
+    if field is None:
+        field = _Field(name, required, location, _Schema(description), None, 'string')
+        interned[key] = field
+    return field
+
+
+def _get_links_from_content(content, keys=()):
+    """
+    Return a sorted list of `(keys, link)`, in exactly the same order as
+    `get_links_from_document` would for the equivalent document.
+    """
+    items = sorted(content.items(), key=_key_sorting)
+    links = [
+        (keys + (key,), value) for key, value in items
+        if isinstance(value, _Link)
+    ]
+    for key, value in items:
+        if not isinstance(value, _Link):
+            links.extend(_get_links_from_content(value, keys + (key,)))
+    return sorted(links, key=link_sorting_key)
+
+
+def _key_sorting(item):
+    """
+    The same ordering as `Document` uses for its keys.
+    """
+    key, value = item
+    if isinstance(value, _Link):
+        return (1, link_sorting_key(item))
+    return (0, key)
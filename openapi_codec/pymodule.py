@@ -0,0 +1,123 @@
+from coreapi.document import Array, Document, Link, Object
+from coreapi.compat import string_types
+import coreschema
+
+
+SCHEMA_CLASSES = (
+    coreschema.String,
+    coreschema.Integer,
+    coreschema.Number,
+    coreschema.Boolean,
+)
+
+
+def generate_python_module(document):
+    """
+    Returns the source of a Python module that reconstructs the document,
+    as the module-level `document` attribute.
+
+    Identical schemas and fields are written once, in lookup tables.
+    """
+    tables = {'schemas': [], 'fields': []}
+    indexes = {}
+    content = _get_content_source(document, tables, indexes, indent=1)
+
+    lines = [
+        '# Generated by openapi-codec. Do not edit.',
+        'from coreapi import Document, Field, Link',
+        'import coreschema',
+        '',
+        '',
+        '_schemas = [',
+    ] + [
+        '    %s,' % source for source in tables['schemas']
+    ] + [
+        ']',
+        '',
+        '_fields = [',
+    ] + [
+        '    %s,' % source for source in tables['fields']
+    ] + [
+        ']',
+        '',
+        'document = Document(',
+        '    url=%r,' % document.url,
+        '    title=%r,' % document.title,
+        '    description=%r,' % document.description,
+        '    media_type=%r,' % document.media_type,
+        '    content=%s' % content,
+        ')',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def _get_content_source(node, tables, indexes, indent):
+    if isinstance(node, Link):
+        return _get_link_source(node, tables, indexes)
+    elif isinstance(node, (Document, Object, dict)):
+        if not node:
+            return '{}'
+        prefix = '    ' * indent
+        items = [
+            '%s    %r: %s,' % (prefix, key, _get_content_source(node[key], tables, indexes, indent + 1))
+            for key in sorted(node.keys())
+        ]
+        return '{\n' + '\n'.join(items) + '\n' + prefix + '}'
+    elif isinstance(node, (Array, list, tuple)):
+        return '[%s]' % ', '.join([
+            _get_content_source(item, tables, indexes, indent) for item in node
+        ])
+    elif node is None or isinstance(node, string_types + (bool, int, float)):
+        return repr(node)
+    raise TypeError('Cannot generate Python source for %r' % node)
+
+
+def _get_link_source(link, tables, indexes):
+    arguments = ['url=%r' % link.url, 'action=%r' % link.action]
+    for attr in ('encoding', 'transform', 'title', 'description'):
+        value = getattr(link, attr)
+        if value:
+            arguments.append('%s=%r' % (attr, value))
+    if link.fields:
+        arguments.append('fields=[%s]' % ', '.join([
+            '_fields[%d]' % _get_field_index(field, tables, indexes)
+            for field in link.fields
+        ]))
+    return 'Link(%s)' % ', '.join(arguments)
+
+
+def _get_field_index(field, tables, indexes):
+    if field.schema is None:
+        schema = 'None'
+    else:
+        schema = '_schemas[%d]' % _get_schema_index(field.schema, tables, indexes)
+    arguments = [
+        'name=%r' % field.name,
+        'required=%r' % field.required,
+        'location=%r' % field.location,
+        'schema=%s' % schema,
+    ]
+    for attr in ('description', 'type', 'example'):
+        value = getattr(field, attr)
+        if value is not None:
+            arguments.append('%s=%s' % (attr, _get_content_source(value, tables, indexes, 0)))
+    return _add_to_table('fields', 'Field(%s)' % ', '.join(arguments), tables, indexes)
+
+
+def _get_schema_index(schema, tables, indexes):
+    if schema.__class__ not in SCHEMA_CLASSES or schema != schema.__class__(
+        title=schema.title, description=schema.description
+    ):
+        raise TypeError('Cannot generate Python source for %r' % schema)
+    source = 'coreschema.%s(title=%r, description=%r)' % (
+        schema.__class__.__name__, schema.title, schema.description
+    )
+    return _add_to_table('schemas', source, tables, indexes)
+
+
+def _add_to_table(table, source, tables, indexes):
+    key = (table, source)
+    if key not in indexes:
+        indexes[key] = len(tables[table])
+        tables[table].append(source)
+    return indexes[key]
@@ -1,12 +1,16 @@
+# The order of links at the same URL, as used by `coreapi.Document`.
+ACTION_PRIORITY = {
+    'get': 0,
+    'post': 1,
+    'put': 2,
+    'patch': 3,
+    'delete': 4
+}
+
+
 def link_sorting_key(link_item):
     keys, link = link_item
-    action_priority = {
-        '': 0, 'get': 0,
-        'post': 1,
-        'put': 2,
-        'patch': 3,
-        'delete': 4
-    }.get(link.action, 5)
+    action_priority = ACTION_PRIORITY.get(link.action or 'get', 5)
     return (link.url, action_priority)
 
 
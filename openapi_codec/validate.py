@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from coreapi.exceptions import ParameterError
+from openapi_codec.utils import get_location
+
+
+# The maximum number of compiled validators kept by `get_validator`.
+MAX_VALIDATORS = 1024
+
+# Compiled validators, keyed by `id(link)`, with the least recently used
+# first. The link is stored alongside its validator, so that the id cannot
+# be reused while the entry exists.
+_validators = OrderedDict()
+
+
+def get_validator(link):
+    """
+    Return the compiled validator for a link, compiling it on first use.
+
+    Only the `MAX_VALIDATORS` most recently used validators are kept.
+    Callers that need a different policy can use `compile_validator`
+    and manage their own cache.
+    """
+    cached = _validators.pop(id(link), None)
+    if cached is not None and cached[0] is link:
+        validator = cached[1]
+    else:
+        validator = compile_validator(link)
+        if len(_validators) >= MAX_VALIDATORS:
+            _validators.popitem(last=False)
+    _validators[id(link)] = (link, validator)
+    return validator
+
+
+def compile_validator(link):
+    """
+    Compile a link into a function that validates a dict of request
+    parameters, and returns them grouped by location, eg.
+
+        {'path': {...}, 'query': {...}, 'form': {...}}
+
+    Raises a `ParameterError` if any parameters do not validate.
+    """
+    locations = {}
+    required = set()
+    for field in link.fields:
+        locations[field.name] = get_location(link, field)
+        if field.required:
+            required.add(field.name)
+    required = frozenset(required)
+    names = frozenset(locations)
+    all_locations = set(locations.values())
+
+    if not locations:
+        return _validate_empty
+
+    if len(all_locations) == 1:
+        # Every field is in the same location, so we only need to check
+        # the names, and can return a copy of the parameters as they are.
+        location = list(all_locations)[0]
+
+        def validate_single_location(params):
+            if not (required.issubset(params) and names.issuperset(params)):
+                _raise_errors(params, locations, required)
+            return {location: dict(params)}
+
+        return validate_single_location
+
+    def validate(params):
+        if not required.issubset(params):
+            _raise_errors(params, locations, required)
+        ret = {location: {} for location in all_locations}
+        for key, value in params.items():
+            location = locations.get(key)
+            if location is None:
+                _raise_errors(params, locations, required)
+            ret[location][key] = value
+        return ret
+
+    return validate
+
+
+def _validate_empty(params):
+    if params:
+        _raise_errors(params, {}, frozenset())
+    return {}
+
+
+def _raise_errors(params, locations, required):
+    errors = {}
+    for key in required:
+        if key not in params:
+            errors[key] = 'This parameter is required.'
+    for key in params:
+        if key not in locations:
+            errors[key] = 'Unknown parameter.'
+    raise ParameterError(errors)
@@ -72,6 +72,9 @@ setup(
     entry_points={
         'coreapi.codecs': [
             'openapi=openapi_codec:OpenAPICodec'
+        ],
+        'console_scripts': [
+            'openapi-codec=openapi_codec.cli:main'
         ]
     }
 )
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Compare decoding a large spec with and without `zero_copy`. Not collected
+by the test suite. Run it directly:
+
+    $ python tests/benchmark_decode.py [operations]
+
+The decoded document is the same in both modes, so the comparison counts
+the containers that the accessor helpers allocate while reading the spec,
+rather than overall memory use, which the decoded links dominate.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openapi_codec import decode  # noqa: E402
+
+
+def get_spec(operations):
+    # Operations without `tags` or `consumes`, and parameters without a
+    # schema `required` list, exercise the defaults for missing values.
+    return {
+        'swagger': '2.0',
+        'info': {'title': 'Benchmark', 'description': ''},
+        'definitions': {
+            'Item': {'type': 'object', 'properties': {'name': {}, 'size': {}}}
+        },
+        'paths': {
+            '/items/%d/' % index: {
+                'get': {
+                    'operationId': 'get%d' % index,
+                    'parameters': [{'name': 'page', 'in': 'query'}]
+                },
+                'post': {
+                    'operationId': 'create%d' % index,
+                    'parameters': [{'name': 'data', 'in': 'body', 'schema': {'$ref': '#/definitions/Item'}}]
+                }
+            }
+            for index in range(operations // 2)
+        }
+    }
+
+
+def get_container_ids(node, ids):
+    ids.add(id(node))
+    if isinstance(node, dict):
+        for value in node.values():
+            get_container_ids(value, ids)
+    elif isinstance(node, list):
+        for value in node:
+            get_container_ids(value, ids)
+    return ids
+
+
+def count_allocations(data, zero_copy):
+    """
+    Return the number and total size of the containers returned by the
+    accessor helpers that are not part of the spec itself.
+    """
+    existing = get_container_ids(data, set([id(decode.EMPTY_DICT), id(decode.EMPTY_LIST)]))
+    totals = {'count': 0, 'bytes': 0}
+
+    def counting(func):
+        def wrapper(*args, **kwargs):
+            ret = func(*args, **kwargs)
+            if id(ret) not in existing:
+                totals['count'] += 1
+                totals['bytes'] += sys.getsizeof(ret)
+            return ret
+        return wrapper
+
+    accessors = decode.ZERO_COPY if zero_copy else decode.COPYING
+    patched = decode._Accessors(*[counting(func) for func in accessors])
+    name = 'ZERO_COPY' if zero_copy else 'COPYING'
+    setattr(decode, name, patched)
+    try:
+        decode._parse_document(data, zero_copy=zero_copy)
+    finally:
+        setattr(decode, name, accessors)
+    return totals['count'], totals['bytes']
+
+
+def measure_times(data, repeat=20):
+    """
+    Return the fastest decode time for each mode. The modes are alternated,
+    so that both are equally affected by any other load on the machine.
+    """
+    times = {False: [], True: []}
+    for _ in range(repeat):
+        for zero_copy in (False, True):
+            start = time.time()
+            decode._parse_document(data, zero_copy=zero_copy)
+            times[zero_copy].append(time.time() - start)
+    return {zero_copy: min(elapsed) for zero_copy, elapsed in times.items()}
+
+
+if __name__ == '__main__':
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    data = get_spec(operations)
+    times = measure_times(data)
+    print('%d operations' % operations)
+    for zero_copy in (False, True):
+        count, size = count_allocations(data, zero_copy)
+        print('zero_copy=%-5s %8d containers allocated %10d bytes %8.1fms' % (
+            zero_copy, count, size, times[zero_copy] * 1000
+        ))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Compare the size and encoding time of a large document, with and without
+`compact`. Not collected by the test suite. Run it directly:
+
+    $ python tests/benchmark_encode.py [links]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openapi_codec import OpenAPICodec  # noqa: E402
+import coreapi  # noqa: E402
+import coreschema  # noqa: E402
+
+
+def get_document(links):
+    # Optional query parameters without descriptions, and a body field with
+    # one, as a typical decoded document would have.
+    content = {}
+    for index in range(links // 2):
+        section = 'section%d' % (index % 100)
+        url = '/items/%d/' % index
+        content.setdefault(section, {})
+        content[section]['list%d' % index] = coreapi.Link(url=url, action='get', fields=[
+            coreapi.Field(name='page', location='query', schema=coreschema.String()),
+            coreapi.Field(name='search', location='query', schema=coreschema.String()),
+        ])
+        content[section]['create%d' % index] = coreapi.Link(url=url, action='post', fields=[
+            coreapi.Field(name='name', location='form', required=True, schema=coreschema.String(
+                description='The item name.'
+            )),
+        ])
+    return coreapi.Document(url='https://example.com/', title='Benchmark', content=content)
+
+
+def measure(document, repeat=20):
+    """
+    Return `{compact: (size, time)}`, with the fastest time for each mode.
+    The modes are alternated, so that both are equally affected by any
+    other load on the machine.
+    """
+    codec = OpenAPICodec()
+    sizes = {}
+    times = {False: [], True: []}
+    for _ in range(repeat):
+        for compact in (False, True):
+            start = time.time()
+            output = codec.encode(document, compact=compact)
+            times[compact].append(time.time() - start)
+            sizes[compact] = len(output)
+    return {compact: (sizes[compact], min(times[compact])) for compact in sizes}
+
+
+if __name__ == '__main__':
+    links = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    results = measure(get_document(links))
+    print('%d links' % links)
+    for compact in (False, True):
+        size, elapsed = results[compact]
+        print('compact=%-5s %10d bytes %8.1fms' % (compact, size, elapsed * 1000))
+    print('%.1f%% smaller' % (100.0 * (results[False][0] - results[True][0]) / results[False][0]))
@@ -0,0 +1,96 @@
+from openapi_codec import OpenAPICodec
+from openapi_codec.cli import main
+import json
+import os
+import shutil
+
+
+test_filepath = os.path.join(os.path.dirname(__file__), 'petstore.json')
+
+
+def test_roundtrip(tmpdir, capsys):
+    source = tmpdir.mkdir('source')
+    destination = tmpdir.join('destination')
+    shutil.copy(test_filepath, str(source.join('petstore.json')))
+    source.mkdir('nested').join('invalid.json').write('{')
+
+    ret = main(['roundtrip', str(source), str(destination), '--workers', '2'])
+    output = capsys.readouterr()[0]
+    assert ret == 1
+    assert '2 files: 1 converted, 0 skipped, 1 failed' in output
+
+    codec = OpenAPICodec()
+    content = destination.join('petstore.json').read_binary()
+    expected = codec.encode(codec.decode(open(test_filepath, 'rb').read()))
+    assert content == expected
+    assert not destination.join('nested', 'invalid.json').exists()
+
+    # Unchanged inputs are skipped on the next run.
+    source.join('nested', 'invalid.json').remove()
+    ret = main(['roundtrip', str(source), str(destination), '--workers', '1'])
+    output = capsys.readouterr()[0]
+    assert ret == 0
+    assert '1 files: 0 converted, 1 skipped, 0 failed' in output
+
+    ret = main(['roundtrip', str(source), str(destination), '--workers', '1', '--force'])
+    output = capsys.readouterr()[0]
+    assert '1 files: 1 converted, 0 skipped, 0 failed' in output
+
+
+def test_decode_and_encode(tmpdir, capsys):
+    source = tmpdir.mkdir('source')
+    shutil.copy(test_filepath, str(source.join('petstore.json')))
+
+    assert main(['decode', str(source), str(tmpdir.join('corejson'))]) == 0
+    assert main(['encode', str(tmpdir.join('corejson')), str(tmpdir.join('openapi'))]) == 0
+
+    codec = OpenAPICodec()
+    original = codec.decode(open(test_filepath, 'rb').read())
+    content = tmpdir.join('openapi', 'petstore.json').read_binary()
+    assert codec.decode(content)['pet'].keys() == original['pet'].keys()
+
+
+def test_skip_requires_same_command(tmpdir, capsys):
+    source = tmpdir.mkdir('source')
+    destination = str(tmpdir.join('destination'))
+    shutil.copy(test_filepath, str(source.join('petstore.json')))
+
+    assert main(['decode', str(source), destination, '--workers', '1']) == 0
+    capsys.readouterr()
+
+    # The output of a different command is not reused.
+    assert main(['roundtrip', str(source), destination, '--workers', '1']) == 0
+    output = capsys.readouterr()[0]
+    assert '1 files: 1 converted, 0 skipped, 0 failed' in output
+
+    codec = OpenAPICodec()
+    content = tmpdir.join('destination', 'petstore.json').read_binary()
+    assert content == codec.encode(codec.decode(open(test_filepath, 'rb').read()))
+
+
+def test_unreadable_input(tmpdir, capsys):
+    source = tmpdir.mkdir('source')
+    destination = tmpdir.join('destination')
+    shutil.copy(test_filepath, str(source.join('petstore.json')))
+    os.symlink(str(source.join('missing')), str(source.join('broken.json')))
+
+    ret = main(['roundtrip', str(source), str(destination), '--workers', '1'])
+    output = capsys.readouterr()[0]
+    assert ret == 1
+    assert '2 files: 1 converted, 0 skipped, 1 failed' in output
+    assert destination.join('.openapi-codec.json').exists()
+
+
+def test_unwritable_output(tmpdir, capsys):
+    source = tmpdir.mkdir('source')
+    destination = tmpdir.mkdir('destination')
+    shutil.copy(test_filepath, str(source.join('petstore.json')))
+    shutil.copy(test_filepath, str(source.join('clash.json')))
+    destination.mkdir('clash.json')
+
+    ret = main(['roundtrip', str(source), str(destination), '--workers', '2'])
+    output = capsys.readouterr()[0]
+    assert ret == 1
+    assert '2 files: 1 converted, 0 skipped, 1 failed' in output
+    manifest = json.loads(destination.join('.openapi-codec.json').read())
+    assert list(manifest.keys()) == ['petstore.json']
@@ -1,6 +1,15 @@
 from coreapi import Document
+from coreapi.exceptions import ParseError
 from openapi_codec import OpenAPICodec
+from openapi_codec.decode import (
+    Limits, _get_dict, _get_dict_view, _get_list, _get_list_view, _parse_document,
+    get_dicts, get_dicts_view, get_strings, get_strings_view
+)
+import copy
+import json
 import os
+import pytest
+import time
 
 
 test_filepath = os.path.join(os.path.dirname(__file__), 'petstore.json')
@@ -13,3 +22,205 @@ def test_decode():
     assert isinstance(document, Document)
     assert set(document.keys()) == set(['pet', 'store', 'user'])
     assert document.title == 'Swagger Petstore'
+
+
+def test_decode_does_not_mutate_input():
+    data = json.loads(open(test_filepath, 'rb').read().decode('utf-8'))
+    original = copy.deepcopy(data)
+    _parse_document(data)
+    assert data == original
+    _parse_document(data, zero_copy=True)
+    assert data == original
+
+
+def test_decode_zero_copy():
+    codec = OpenAPICodec()
+    content = open(test_filepath, 'rb').read()
+    assert codec.decode(content, zero_copy=True) == codec.decode(content)
+
+
+def test_accessors_copy():
+    item = {'list': [{'a': 1}], 'strings': ['a']}
+    assert _get_dict(item, 'missing') is not _get_dict({}, 'other')
+    assert _get_list(item, 'missing') is not _get_list({}, 'other')
+    assert get_dicts(item['list']) is not item['list']
+    assert get_strings(item['strings']) is not item['strings']
+
+
+def test_zero_copy_accessors():
+    item = {'dict': {'a': 1}, 'list': [{'a': 1}, {'$ref': '#/dict'}], 'strings': ['a', 'b']}
+    assert _get_dict_view(item, 'dict') is item['dict']
+    assert _get_list_view(item, 'list') is item['list']
+    assert get_dicts_view(item['list']) is item['list']
+    assert get_strings_view(item['strings']) is item['strings']
+
+    # Missing values return a shared, read-only, empty default.
+    assert _get_dict_view(item, 'missing') is _get_dict_view({}, 'other')
+    assert _get_list_view(item, 'missing') is _get_list_view({}, 'other')
+    with pytest.raises(TypeError):
+        _get_dict_view(item, 'missing')['a'] = 1
+    with pytest.raises(TypeError):
+        empty = _get_dict_view(item, 'missing')
+        empty |= {'a': 1}
+    with pytest.raises(TypeError):
+        dict.__init__(_get_dict_view(item, 'missing'), a=1)
+    assert _get_dict_view(item, 'missing') == {}
+
+    # Items are only copied when they need filtering or dereferencing.
+    assert get_dicts_view(item['list'], dereference_using=item) == [{'a': 1}, {'a': 1}]
+    assert get_dicts_view([{'a': 1}, 1, {'b': 2}]) == [{'a': 1}, {'b': 2}]
+    assert get_strings_view(['a', 1, 'b']) == ['a', 'b']
+
+
+def test_decode_shares_identical_fields():
+    page = {'name': 'page', 'in': 'query', 'description': 'Page number.'}
+    data = {'paths': {
+        '/users/': {'get': {'operationId': 'users', 'parameters': [dict(page)]}},
+        '/groups/': {'get': {'operationId': 'groups', 'parameters': [
+            dict(page), {'name': 'search', 'in': 'query', 'description': 'Page number.'}
+        ]}},
+    }}
+    document = _parse_document(data)
+    users = document['users'].fields
+    groups = document['groups'].fields
+    assert users[0] is groups[0]
+    assert users[0].schema is groups[1].schema
+    assert document['users'].action is document['groups'].action
+
+
+def spec(operations=1, parameters=1, properties=0, ref=None):
+    body = {'name': 'data', 'in': 'body', 'schema': {
+        'type': 'object',
+        'properties': {'p%d' % index: {} for index in range(properties)},
+        'required': ['p%d' % index for index in range(properties)]
+    }}
+    if ref is not None:
+        body['schema'] = {'$ref': ref}
+    params = [{'name': 'q%d' % index, 'in': 'query'} for index in range(parameters)]
+    return json.dumps({'paths': {
+        '/%d/' % index: {'post': {'operationId': 'op%d' % index, 'parameters': params + [body]}}
+        for index in range(operations)
+    }}).encode('utf-8')
+
+
+def test_decode_limits():
+    codec = OpenAPICodec()
+    content = spec(operations=10, parameters=10)
+    assert len(codec.decode(content, max_bytes=len(content), max_operations=10, max_parameters=11).keys()) == 10
+
+    with pytest.raises(ParseError):
+        codec.decode(content, max_bytes=len(content) - 1)
+    with pytest.raises(ParseError):
+        codec.decode(content, max_operations=9)
+    with pytest.raises(ParseError):
+        codec.decode(content, max_parameters=10)
+    with pytest.raises(ParseError):
+        codec.decode(content, timeout=-1)
+
+
+class Clock(object):
+    # A clock that advances by one second every time it is read.
+    def __init__(self):
+        self.now = 0
+
+    def time(self):
+        self.now += 1
+        return self.now
+
+
+def test_decode_timeout_within_operation(monkeypatch):
+    codec = OpenAPICodec()
+    content = spec(parameters=1000)
+    monkeypatch.setattr('openapi_codec.decode.time', Clock())
+    with pytest.raises(ParseError):
+        codec.decode(content, timeout=100)
+
+
+def test_decode_limits_cumulative_parameters():
+    codec = OpenAPICodec()
+    bodies = [
+        {'name': 'data%d' % index, 'in': 'body', 'schema': {
+            'type': 'object',
+            'properties': {'p%d_%d' % (index, prop): {} for prop in range(5)}
+        }}
+        for index in range(5)
+    ]
+    content = json.dumps({'paths': {
+        '/': {'post': {'operationId': 'op', 'parameters': bodies}}
+    }}).encode('utf-8')
+    codec.decode(content, max_parameters=25)
+    with pytest.raises(ParseError):
+        codec.decode(content, max_parameters=10)
+
+
+def test_decode_limits_parameters_after_body():
+    codec = OpenAPICodec()
+    parameters = [
+        {'name': 'data', 'in': 'body', 'schema': {
+            'type': 'object',
+            'properties': {'a': {}, 'b': {}, 'c': {}}
+        }},
+        {'name': 'page', 'in': 'query'},
+        {'name': 'search', 'in': 'query'},
+    ]
+    content = json.dumps({'paths': {
+        '/': {'post': {'operationId': 'op', 'parameters': parameters}}
+    }}).encode('utf-8')
+    assert len(codec.decode(content, max_parameters=5)['op'].fields) == 5
+    with pytest.raises(ParseError):
+        codec.decode(content, max_parameters=4)
+
+
+def test_limits_apply_to_all_decoders():
+    codec = OpenAPICodec()
+    content = spec(operations=10)
+    with pytest.raises(ParseError):
+        codec.normalize(content, max_operations=9)
+    with pytest.raises(ParseError):
+        codec.decode_shards(content, lambda name: None, max_operations=9)
+    with pytest.raises(ParseError):
+        codec.diff(content, content, max_operations=9)
+    with pytest.raises(ParseError):
+        codec.diff(content, content, max_bytes=len(content) - 1)
+    with pytest.raises(ParseError):
+        codec.diff(content, content, timeout=-1)
+
+
+def test_decode_limits_pathological_input():
+    codec = OpenAPICodec()
+    data = json.loads(spec(operations=20000, parameters=0).decode('utf-8'))
+    start = time.time()
+    _parse_document(data)
+    unlimited = time.time() - start
+
+    # Decoding stops as soon as the limit is reached, rather than after
+    # building every link.
+    start = time.time()
+    with pytest.raises(ParseError):
+        _parse_document(data, limits=Limits(max_operations=100))
+    assert time.time() - start < unlimited / 10
+
+    content = spec(parameters=20000)
+    start = time.time()
+    with pytest.raises(ParseError):
+        codec.decode(content, max_parameters=100)
+    assert time.time() - start < 1.0
+
+
+def test_decode_limits_ref_depth():
+    codec = OpenAPICodec()
+    content = spec(ref='#/definitions/a/b/c')
+    codec.decode(content, max_ref_depth=4)
+    with pytest.raises(ParseError):
+        codec.decode(content, max_ref_depth=3)
+
+
+def test_decode_limits_expanded_properties():
+    codec = OpenAPICodec()
+    content = spec(properties=20000)
+    with pytest.raises(ParseError):
+        codec.decode(content, max_parameters=1000)
+
+    # Field de-duplication is linear, so large schemas still decode quickly.
+    document = codec.decode(content)
+    assert len(document['op0'].fields) == 20001
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from coreapi.exceptions import ParseError
+from openapi_codec import OpenAPICodec
+from openapi_codec.diff import diff_spec_hashes, get_spec_hashes
+import copy
+import json
+import os
+import pytest
+import time
+
+
+test_filepath = os.path.join(os.path.dirname(__file__), 'petstore.json')
+
+codec = OpenAPICodec()
+data = json.loads(open(test_filepath, 'rb').read().decode('utf-8'))
+
+
+def dump(data):
+    return json.dumps(data).encode('utf-8')
+
+
+def test_diff_unchanged():
+    diff = codec.diff(dump(data), dump(copy.deepcopy(data)))
+    assert diff == ([], [], [])
+
+
+def test_diff_operations():
+    new = copy.deepcopy(data)
+    del new['paths']['/user/logout']
+    new['paths']['/pet/findByStatus']['get']['summary'] = 'Changed'
+    new['paths']['/pet/{petId}/history'] = {
+        'get': {'operationId': 'getPetHistory', 'tags': ['pet']}
+    }
+
+    diff = codec.diff(dump(data), dump(new))
+    assert diff.added == [('pet', 'getPetHistory')]
+    assert diff.removed == [('user', 'logoutUser')]
+    assert diff.modified == [('pet', 'findPetsByStatus')]
+
+
+def test_diff_referenced_definition():
+    new = copy.deepcopy(data)
+    new['definitions']['Order']['properties']['quantity']['description'] = 'Changed'
+
+    diff = codec.diff(dump(data), dump(new))
+    assert diff.added == []
+    assert diff.removed == []
+    assert diff.modified == [('store', 'placeOrder')]
+
+
+def test_diff_uppercase_method():
+    old = {'paths': {'/items/': {'GET': {'operationId': 'a'}}}}
+    new = {'paths': {'/items/': {'GET': {'operationId': 'b'}}}}
+
+    # The decoder reads operations by their lowercased method, so both
+    # versions decode to the same link, and the diff agrees.
+    assert codec.decode(dump(old)) == codec.decode(dump(new))
+    assert codec.diff(dump(old), dump(new)) == ([], [], [])
+    keys = list(get_spec_hashes(old).paths['/items/'].operations.values())[0].keys
+    assert keys == tuple(codec.decode(dump(old)).keys())
+
+
+def test_diff_limits_body_schema_refs():
+    spec = {'paths': {'/items/': {'post': {'operationId': 'create', 'parameters': [
+        {'name': 'data', 'in': 'body', 'schema': {'$ref': '#/definitions/a/b/c'}}
+    ]}}}}
+    codec.diff(dump(spec), dump(spec), max_ref_depth=4)
+    with pytest.raises(ParseError):
+        codec.diff(dump(spec), dump(spec), max_ref_depth=2)
+    with pytest.raises(ParseError):
+        codec.decode(dump(spec), max_ref_depth=2)
+
+
+def nested_spec(levels, path_order=None):
+    """
+    A spec where each definition references the next one twice, and the
+    last one references both itself and the first.
+    """
+    definitions = {}
+    for index in range(levels):
+        next_ref = {'$ref': '#/definitions/d%d' % ((index + 1) % levels)}
+        definitions['d%d' % index] = {
+            'type': 'object',
+            'description': 'Level %d' % index,
+            'properties': {
+                'a': next_ref,
+                'b': dict(next_ref),
+                'self': {'$ref': '#/definitions/d%d' % index},
+            }
+        }
+    paths = [
+        ('/first/', {'post': {'operationId': 'first', 'parameters': [
+            {'name': 'data', 'in': 'body', 'schema': {'$ref': '#/definitions/d0'}}
+        ]}}),
+        ('/last/', {'post': {'operationId': 'last', 'parameters': [
+            {'name': 'data', 'in': 'body', 'schema': {'$ref': '#/definitions/d%d' % (levels - 1)}}
+        ]}}),
+        ('/plain/', {'get': {'operationId': 'plain'}}),
+    ]
+    if path_order is not None:
+        paths = [paths[index] for index in path_order]
+    return {'paths': OrderedDict(paths), 'definitions': definitions}
+
+
+def test_hash_nested_recursive_refs():
+    old = nested_spec(200)
+    start = time.time()
+    old_hashes = get_spec_hashes(old)
+    assert time.time() - start < 1.0
+
+    # Recursive references hash the same whichever operation reaches them first.
+    reordered = get_spec_hashes(nested_spec(200, path_order=[1, 0, 2]))
+    for path in old_hashes.paths:
+        assert reordered.paths[path].hash == old_hashes.paths[path].hash
+
+    # A change deep in the chain modifies every operation that can reach it.
+    new = copy.deepcopy(old)
+    new['definitions']['d150']['description'] = 'Changed'
+    diff = diff_spec_hashes(old_hashes, get_spec_hashes(new))
+    assert diff == ([], [], [('first',), ('last',)])
+
+
+def test_decode_incremental_nested_recursive_refs():
+    content = dump(nested_spec(200))
+    start = time.time()
+    result = codec.decode_incremental(content)
+    codec.decode_incremental(content, previous=result)
+    assert time.time() - start < 1.0
@@ -106,3 +106,46 @@ class TestParameters(TestCase):
             'type': 'string'  # Everything is a string for now.
         }
         self.assertEquals(self.swagger[0], expected)
+
+
+class TestCompactParameters(TestCase):
+    def setUp(self):
+        self.link = coreapi.Link(action='post', fields=[
+            coreapi.Field(name='id', location='path', required=False),
+            coreapi.Field(name='email', location='query'),
+            coreapi.Field(name='name', location='form', required=True),
+            coreapi.Field(name='bio', location='form', schema=coreschema.String(description='About you.')),
+        ])
+        self.swagger = _get_parameters(self.link, encoding='application/json', compact=True)
+
+    def test_expected_fields(self):
+        expected = [
+            {'name': 'id', 'required': False, 'in': 'path', 'type': 'string'},
+            {'name': 'email', 'in': 'query', 'type': 'string'},
+            {
+                'name': 'data',
+                'in': 'body',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'name': {'type': 'string', 'description': ''},
+                        'bio': {'type': 'string', 'description': 'About you.'}
+                    },
+                    'required': ['name']
+                }
+            }
+        ]
+        self.assertEqual(self.swagger, expected)
+
+    def test_shared_responses(self):
+        document = coreapi.Document(content={
+            'a': coreapi.Link(url='/a/', action='post'),
+            'b': coreapi.Link(url='/b/', action='post'),
+        })
+        swagger = generate_swagger_object(document, compact=True)
+        self.assertNotIn('description', swagger['info'])
+        responses = [
+            path_item['post']['responses']
+            for path_item in swagger['paths'].values()
+        ]
+        self.assertIs(responses[0], responses[1])
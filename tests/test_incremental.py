@@ -0,0 +1,134 @@
+from coreapi.exceptions import ParseError
+from openapi_codec import OpenAPICodec
+from openapi_codec.incremental import IncrementalEncoder
+import coreapi
+import copy
+import json
+import os
+import pytest
+
+
+test_filepath = os.path.join(os.path.dirname(__file__), 'petstore.json')
+
+codec = OpenAPICodec()
+data = json.loads(open(test_filepath, 'rb').read().decode('utf-8'))
+
+
+def dump(data):
+    return json.dumps(data).encode('utf-8')
+
+
+def test_decode_incremental():
+    previous = codec.decode_incremental(dump(data))
+    assert previous.document == codec.decode(dump(data))
+
+    new = copy.deepcopy(data)
+    new['paths']['/pet/findByStatus']['get']['summary'] = 'Changed'
+    new['definitions']['User']['properties']['email']['description'] = 'Changed'
+    result = codec.decode_incremental(dump(new), previous=previous)
+
+    assert result.document == codec.decode(dump(new))
+
+    # Unchanged path items reuse the previous links.
+    assert result.document['pet']['getPetById'] is previous.document['pet']['getPetById']
+    assert result.document['store']['placeOrder'] is previous.document['store']['placeOrder']
+
+    # Changed path items, or those with changed dependencies, are rebuilt.
+    assert result.document['pet']['findPetsByStatus'] is not previous.document['pet']['findPetsByStatus']
+    assert result.document['user']['createUser'] is not previous.document['user']['createUser']
+    assert result.document['user']['createUser'] != previous.document['user']['createUser']
+
+
+def test_decode_incremental_base_url():
+    previous = codec.decode_incremental(dump(data))
+    result = codec.decode_incremental(dump(data), previous=previous, base_url='https://example.com/')
+    assert result.document == codec.decode(dump(data), base_url='https://example.com/')
+
+
+def test_incremental_encoder():
+    document = codec.decode(dump(data))
+    for compact in (False, True):
+        encoder = IncrementalEncoder(compact=compact)
+        assert encoder.encode(document) == codec.encode(document, compact=compact)
+
+        previous = dict(encoder._operations)
+        link = document['pet']['findPetsByStatus']
+        changed = document.set_in(['pet', 'findPetsByStatus'], coreapi.Link(
+            url=link.url, action=link.action, fields=link.fields[:0]
+        ))
+        assert encoder.encode(changed) == codec.encode(changed, compact=compact)
+
+        reused = [
+            fingerprint for fingerprint, operation in encoder._operations.items()
+            if previous.get(fingerprint) is operation
+        ]
+        assert len(reused) == len(previous) - 1
+
+        # Duplicate operation ids cause every operation id to be prefixed.
+        changed = changed.set_in(['store', 'createUser'], document['user']['createUser'])
+        assert encoder.encode(changed) == codec.encode(changed, compact=compact)
+
+
+def test_incremental_encoder_empty_document():
+    document = coreapi.Document(url='https://example.com/', title='Example')
+    assert IncrementalEncoder().encode(document) == codec.encode(document)
+
+
+def test_incremental_encoder_unhashable_description():
+    content = dump({'paths': {'/items/': {'post': {'operationId': 'create', 'parameters': [
+        {'name': 'data', 'in': 'body', 'schema': {
+            'type': 'object',
+            'properties': {'name': {'description': ['weird']}}
+        }}
+    ]}}}})
+    document = codec.decode(content)
+    encoder = IncrementalEncoder()
+    assert encoder.encode(document) == codec.encode(document)
+    assert encoder.encode(document) == codec.encode(document)
+
+
+def test_decode_incremental_limits():
+    document = codec.decode(dump(data))
+    links = [link for key in document.keys() for link in document[key].values()]
+    max_fields = max([len(link.fields) for link in links])
+    previous = codec.decode_incremental(dump(data))
+
+    # The limits apply the same way as for `decode`, including to reused links.
+    for prev in (None, previous):
+        result = codec.decode_incremental(
+            dump(data), previous=prev, max_operations=len(links), max_parameters=max_fields
+        )
+        assert result.document == document
+        with pytest.raises(ParseError):
+            codec.decode_incremental(dump(data), previous=prev, max_operations=len(links) - 1)
+        with pytest.raises(ParseError):
+            codec.decode_incremental(dump(data), previous=prev, max_parameters=max_fields - 1)
+        with pytest.raises(ParseError):
+            codec.decode_incremental(dump(data), previous=prev, max_bytes=10)
+        with pytest.raises(ParseError):
+            codec.decode_incremental(dump(data), previous=prev, timeout=-1)
+
+    # Parameters after an expanded body, and body schema refs, are checked
+    # the same way with or without a previous result.
+    content = dump({'paths': {'/items/': {'post': {'operationId': 'create', 'parameters': [
+        {'name': 'data', 'in': 'body', 'schema': {
+            'type': 'object',
+            'properties': {'a': {}, 'b': {}, 'c': {}}
+        }},
+        {'name': 'page', 'in': 'query'},
+        {'name': 'search', 'in': 'query'},
+    ]}}}})
+    previous = codec.decode_incremental(content)
+    for prev in (None, previous):
+        codec.decode_incremental(content, previous=prev, max_parameters=5)
+        with pytest.raises(ParseError):
+            codec.decode_incremental(content, previous=prev, max_parameters=4)
+
+    content = dump({'paths': {'/items/': {'post': {'operationId': 'create', 'parameters': [
+        {'name': 'data', 'in': 'body', 'schema': {'$ref': '#/definitions/a/b/c'}}
+    ]}}}})
+    previous = codec.decode_incremental(content)
+    for prev in (None, previous):
+        codec.decode_incremental(content, previous=prev, max_ref_depth=4)
+        with pytest.raises(ParseError):
+            codec.decode_incremental(content, previous=prev, max_ref_depth=2)
@@ -207,3 +207,47 @@ def test_mapping():
             )
         ]
     )
+
+
+def test_sharded_mapping():
+    """
+    Ensure that a document that is encoded into sharded OpenAPI and then
+    decoded comes back the same as the unsharded round trip.
+    """
+    index, shards = codec.encode_shards(doc)
+    assert list(shards.keys()) == ['encoding', 'location']
+
+    new = codec.decode_shards(index, lambda name: shards[name])
+    assert new == codec.load(codec.dump(doc))
+
+
+def test_sharded_mapping_loads_requested_sections():
+    index, shards = codec.encode_shards(doc)
+    loaded = []
+
+    def load_shard(name):
+        loaded.append(name)
+        return shards[name]
+
+    new = codec.decode_shards(index, load_shard, sections=['location'])
+    assert loaded == ['location']
+    assert set(new.keys()) == set(['simple_link', 'location'])
+    assert new['location'] == codec.load(codec.dump(doc))['location']
+
+
+def test_compact_mapping():
+    """
+    Ensure that a compact encoding decodes to the same document.
+    """
+    content = codec.dump(doc, compact=True)
+    assert len(content) < len(codec.dump(doc))
+    assert b', ' not in content
+    assert codec.load(content) == codec.load(codec.dump(doc))
+
+
+def test_parallel_encode():
+    """
+    Ensure that encoding in parallel gives exactly the same output.
+    """
+    assert codec.dump(doc, workers=2) == codec.dump(doc)
+    assert codec.dump(doc, workers=2, compact=True) == codec.dump(doc, compact=True)
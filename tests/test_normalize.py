@@ -0,0 +1,71 @@
+from openapi_codec import OpenAPICodec
+from openapi_codec.decode import _parse_document
+from openapi_codec.normalize import _get_links_from_content, _parse_content
+from openapi_codec.utils import get_links_from_document
+import json
+import os
+
+
+test_filepath = os.path.join(os.path.dirname(__file__), 'petstore.json')
+
+codec = OpenAPICodec()
+
+
+def test_normalize():
+    content = open(test_filepath, 'rb').read()
+    assert codec.normalize(content) == codec.encode(codec.decode(content))
+
+    base_url = 'https://example.com/'
+    assert codec.normalize(content, base_url=base_url, compact=True) == codec.encode(
+        codec.decode(content, base_url=base_url), compact=True
+    )
+
+
+def test_normalize_edge_cases():
+    data = {
+        'info': {'title': 'Example'},
+        'consumes': ['application/x-www-form-urlencoded'],
+        'paths': {
+            '/items/': {
+                'parameters': [{'name': 'page', 'in': 'query'}],
+                'HEAD': {'operationId': 'head'},
+                'options': {'operationId': 'options'},
+                'get': {'operationId': 'list', 'tags': ['items']},
+                'post': {'operationId': 'items_create', 'tags': ['items'], 'parameters': [
+                    {'name': 'data', 'in': 'body', 'schema': {
+                        'type': 'object',
+                        'properties': {'name': {}, 'notes': {'description': 'Notes.'}},
+                        'required': ['name']
+                    }},
+                    {'name': 'file', 'in': 'formData'},
+                ]},
+            },
+            '/other/': {
+                'get': {'operationId': 'list', 'tags': ['other']},
+                'delete': {'operationId': 'items', 'description': 'Overlaps a tag.'},
+            },
+        }
+    }
+    content = json.dumps(data).encode('utf-8')
+    assert codec.normalize(content) == codec.encode(codec.decode(content))
+
+
+def test_link_ordering_matches_document():
+    data = {'paths': {
+        '/items/': {
+            'options': {'operationId': 'options'},
+            'head': {'operationId': 'head'},
+            'get': {'operationId': 'list'},
+            'delete': {'operationId': 'items_delete', 'tags': ['items']},
+            'put': {'operationId': 'update', 'tags': ['items']},
+        },
+        '/a/': {
+            'head': {'operationId': 'a_head', 'tags': ['items']},
+            'get': {'operationId': 'a', 'tags': ['items']},
+        },
+    }}
+    document = _parse_document(data)
+    expected = [(keys, link.action) for keys, link in get_links_from_document(document)]
+
+    content = _parse_content(data)[1]
+    assert [(keys, link.action) for keys, link in _get_links_from_content(content)] == expected
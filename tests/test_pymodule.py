@@ -0,0 +1,45 @@
+from openapi_codec import OpenAPICodec
+from openapi_codec.pymodule import generate_python_module
+import coreapi
+import coreschema
+import os
+import pytest
+
+
+test_filepath = os.path.join(os.path.dirname(__file__), 'petstore.json')
+
+
+def load_module(source):
+    namespace = {}
+    exec(compile(source, 'schema.py', 'exec'), namespace)
+    return namespace['document']
+
+
+def test_generate_python_module():
+    codec = OpenAPICodec()
+    document = codec.decode(open(test_filepath, 'rb').read())
+    source = generate_python_module(document)
+    assert load_module(source) == document
+
+
+def test_generate_python_module_nested_content():
+    document = coreapi.Document(url='/', title='Example', content={
+        'users': {
+            'list': coreapi.Link('/users/', action='get', fields=[
+                coreapi.Field('page', location='query', schema=coreschema.Integer(description='Page.'))
+            ]),
+            'info': {'count': 3, 'tags': ['a', 'b'], 'active': True}
+        },
+        'version': None,
+    })
+    assert load_module(generate_python_module(document)) == document
+
+
+def test_generate_python_module_unsupported_schema():
+    document = coreapi.Document(content={
+        'list': coreapi.Link('/users/', fields=[
+            coreapi.Field('page', schema=coreschema.Integer(minimum=1))
+        ])
+    })
+    with pytest.raises(TypeError):
+        generate_python_module(document)
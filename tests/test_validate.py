@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from coreapi.exceptions import ParameterError
+from openapi_codec import validate as validate_module
+from openapi_codec.validate import compile_validator, get_validator
+import coreapi
+import pytest
+
+
+link = coreapi.Link(url='/users/{id}/', action='put', fields=[
+    coreapi.Field(name='id', location='path', required=True),
+    coreapi.Field(name='expand', location='query'),
+    coreapi.Field(name='email', required=True),
+    coreapi.Field(name='name'),
+])
+
+
+def test_validate():
+    validate = compile_validator(link)
+    params = validate({'id': 1, 'expand': 'groups', 'email': 'a@example.com'})
+    assert params == {
+        'path': {'id': 1},
+        'query': {'expand': 'groups'},
+        'form': {'email': 'a@example.com'}
+    }
+
+
+def test_validate_errors():
+    validate = compile_validator(link)
+    with pytest.raises(ParameterError) as exc:
+        validate({'email': 'a@example.com', 'other': 1})
+    assert exc.value.args[0] == {
+        'id': 'This parameter is required.',
+        'other': 'Unknown parameter.'
+    }
+
+
+def test_validate_single_location():
+    validate = compile_validator(coreapi.Link(url='/users/', fields=[
+        coreapi.Field(name='page'),
+        coreapi.Field(name='search', required=True)
+    ]))
+    assert validate({'search': 'a'}) == {'query': {'search': 'a'}}
+    with pytest.raises(ParameterError):
+        validate({'page': 1})
+    with pytest.raises(ParameterError):
+        validate({'search': 'a', 'other': 1})
+
+
+def test_validate_no_fields():
+    validate = compile_validator(coreapi.Link(url='/users/'))
+    assert validate({}) == {}
+    with pytest.raises(ParameterError):
+        validate({'other': 1})
+
+
+def test_validator_is_cached():
+    assert get_validator(link) is get_validator(link)
+    assert get_validator(link) is not get_validator(coreapi.Link(url='/users/'))
+
+
+def test_validator_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(validate_module, 'MAX_VALIDATORS', 2)
+    monkeypatch.setattr(validate_module, '_validators', OrderedDict())
+    first = coreapi.Link(url='/first/')
+    second = coreapi.Link(url='/second/')
+    third = coreapi.Link(url='/third/')
+    cached = get_validator(first)
+    get_validator(second)
+    get_validator(first)
+    get_validator(third)
+
+    # The least recently used validator is evicted.
+    assert len(validate_module._validators) == 2
+    assert get_validator(first) is cached
+    assert id(second) not in validate_module._validators
+
+
+def test_validate_single_location_returns_copy():
+    validate = compile_validator(coreapi.Link(url='/users/', fields=[
+        coreapi.Field(name='search')
+    ]))
+    params = {'search': 'a'}
+    result = validate(params)
+    result['query']['search'] = 'b'
+    assert params == {'search': 'a'}